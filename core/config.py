@@ -6,6 +6,8 @@ Handles environment variables, multi-account settings, and production deployment
 import os
 import json
 import logging
+import logging.handlers
+from functools import lru_cache
 from typing import Dict, List, Optional, Any
 from pathlib import Path
 
@@ -21,33 +23,39 @@ logger = logging.getLogger(__name__)
 class Config:
     """Configuration class for Google Workspace MCP Server"""
     
+    # Logging is process-wide, so only configure it once across instances
+    _logging_configured = False
+    
     def __init__(self):
         self._load_config()
     
     def _load_config(self):
         """Load configuration from environment variables"""
+        # Snapshot the environment once instead of calling os.getenv per setting
+        env = dict(os.environ)
         
         # Server Configuration
-        self.PORT = int(os.getenv("PORT", os.getenv("WORKSPACE_MCP_PORT", 8000)))
+        self.PORT = int(env.get("PORT", env.get("WORKSPACE_MCP_PORT", 8000)))
         self.WORKSPACE_MCP_PORT = self.PORT
-        self.WORKSPACE_MCP_BASE_URI = os.getenv("WORKSPACE_MCP_BASE_URI", "http://localhost")
-        self.ENVIRONMENT = os.getenv("ENVIRONMENT", "development")
+        self.WORKSPACE_MCP_BASE_URI = env.get("WORKSPACE_MCP_BASE_URI", "http://localhost")
+        self.ENVIRONMENT = env.get("ENVIRONMENT", "development")
         
         # Google OAuth Configuration
-        self.GOOGLE_CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID", "")
-        self.GOOGLE_CLIENT_SECRET = os.getenv("GOOGLE_CLIENT_SECRET", "")
-        self.USER_GOOGLE_EMAIL = os.getenv("USER_GOOGLE_EMAIL", "")
+        self.GOOGLE_CLIENT_ID = env.get("GOOGLE_CLIENT_ID", "")
+        self.GOOGLE_CLIENT_SECRET = env.get("GOOGLE_CLIENT_SECRET", "")
+        self.USER_GOOGLE_EMAIL = env.get("USER_GOOGLE_EMAIL", "")
         
         # Multi-account Configuration
-        self.MULTI_ACCOUNT_ENABLED = os.getenv("MULTI_ACCOUNT_ENABLED", "true").lower() == "true"
-        allowed_accounts_str = os.getenv("ALLOWED_GOOGLE_ACCOUNTS", "")
+        self.MULTI_ACCOUNT_ENABLED = env.get("MULTI_ACCOUNT_ENABLED", "true").lower() == "true"
+        allowed_accounts_str = env.get("ALLOWED_GOOGLE_ACCOUNTS", "")
         self.ALLOWED_GOOGLE_ACCOUNTS = [
             email.strip() for email in allowed_accounts_str.split(",") 
             if email.strip()
         ] if allowed_accounts_str else []
+        self._allowed_lower_set = frozenset(account.lower() for account in self.ALLOWED_GOOGLE_ACCOUNTS)
         
         # Account-specific configurations
-        account_configs_str = os.getenv("ACCOUNT_CONFIGS", "{}")
+        account_configs_str = env.get("ACCOUNT_CONFIGS", "{}")
         try:
             self.ACCOUNT_CONFIGS = json.loads(account_configs_str)
         except json.JSONDecodeError:
@@ -55,58 +63,60 @@ class Config:
             self.ACCOUNT_CONFIGS = {}
         
         # Security Configuration
-        self.JWT_SECRET = os.getenv("JWT_SECRET", "default_secret_change_in_production")
-        self.SESSION_TIMEOUT_HOURS = int(os.getenv("SESSION_TIMEOUT_HOURS", 24))
-        self.CORS_ENABLED = os.getenv("CORS_ENABLED", "true").lower() == "true"
-        cors_origins_str = os.getenv("CORS_ORIGINS", "")
+        self.JWT_SECRET = env.get("JWT_SECRET", "default_secret_change_in_production")
+        self.SESSION_TIMEOUT_HOURS = int(env.get("SESSION_TIMEOUT_HOURS", 24))
+        self.CORS_ENABLED = env.get("CORS_ENABLED", "true").lower() == "true"
+        cors_origins_str = env.get("CORS_ORIGINS", "")
         self.CORS_ORIGINS = [
             origin.strip() for origin in cors_origins_str.split(",") 
             if origin.strip()
         ] if cors_origins_str else ["*"]
         
         # Logging Configuration
-        self.LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
-        self.FILE_LOGGING_ENABLED = os.getenv("FILE_LOGGING_ENABLED", "true").lower() == "true"
-        self.LOG_FILE_PATH = os.getenv("LOG_FILE_PATH", "logs/mcp_server.log")
+        self.LOG_LEVEL = env.get("LOG_LEVEL", "INFO").upper()
+        self.FILE_LOGGING_ENABLED = env.get("FILE_LOGGING_ENABLED", "true").lower() == "true"
+        self.LOG_FILE_PATH = env.get("LOG_FILE_PATH", "logs/mcp_server.log")
+        self.LOG_FILE_MAX_BYTES = int(env.get("LOG_FILE_MAX_BYTES", 10 * 1024 * 1024))
+        self.LOG_FILE_BACKUP_COUNT = int(env.get("LOG_FILE_BACKUP_COUNT", 5))
         
         # SSL/TLS Configuration
-        self.SSL_ENABLED = os.getenv("SSL_ENABLED", "false").lower() == "true"
-        self.SSL_CERT_PATH = os.getenv("SSL_CERT_PATH", "")
-        self.SSL_KEY_PATH = os.getenv("SSL_KEY_PATH", "")
+        self.SSL_ENABLED = env.get("SSL_ENABLED", "false").lower() == "true"
+        self.SSL_CERT_PATH = env.get("SSL_CERT_PATH", "")
+        self.SSL_KEY_PATH = env.get("SSL_KEY_PATH", "")
         
         # Proxy Configuration
-        self.BEHIND_PROXY = os.getenv("BEHIND_PROXY", "false").lower() == "true"
-        self.PROXY_HEADERS = os.getenv("PROXY_HEADERS", "true").lower() == "true"
+        self.BEHIND_PROXY = env.get("BEHIND_PROXY", "false").lower() == "true"
+        self.PROXY_HEADERS = env.get("PROXY_HEADERS", "true").lower() == "true"
         
         # Rate Limiting
-        self.RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
-        self.RATE_LIMIT_REQUESTS_PER_MINUTE = int(os.getenv("RATE_LIMIT_REQUESTS_PER_MINUTE", 60))
+        self.RATE_LIMIT_ENABLED = env.get("RATE_LIMIT_ENABLED", "true").lower() == "true"
+        self.RATE_LIMIT_REQUESTS_PER_MINUTE = int(env.get("RATE_LIMIT_REQUESTS_PER_MINUTE", 60))
         
         # Claude Web Integration
-        self.MCP_SERVER_URL = os.getenv("MCP_SERVER_URL", f"{self.WORKSPACE_MCP_BASE_URI}:{self.PORT}/mcp")
-        self.MCP_SERVER_NAME = os.getenv("MCP_SERVER_NAME", "Google Workspace MCP")
-        self.MCP_SERVER_DESCRIPTION = os.getenv("MCP_SERVER_DESCRIPTION", "Google Workspace integration for Claude")
+        self.MCP_SERVER_URL = env.get("MCP_SERVER_URL", f"{self.WORKSPACE_MCP_BASE_URI}:{self.PORT}/mcp")
+        self.MCP_SERVER_NAME = env.get("MCP_SERVER_NAME", "Google Workspace MCP")
+        self.MCP_SERVER_DESCRIPTION = env.get("MCP_SERVER_DESCRIPTION", "Google Workspace integration for Claude")
         
         # Tools Configuration
-        default_tools_str = os.getenv("DEFAULT_TOOLS", "gmail,drive,calendar,docs,sheets")
+        default_tools_str = env.get("DEFAULT_TOOLS", "gmail,drive,calendar,docs,sheets")
         self.DEFAULT_TOOLS = [
             tool.strip() for tool in default_tools_str.split(",") 
             if tool.strip()
         ] if default_tools_str else []
         
         # Tool-specific configurations
-        self.GMAIL_MAX_RESULTS = int(os.getenv("GMAIL_MAX_RESULTS", 50))
-        self.DRIVE_MAX_RESULTS = int(os.getenv("DRIVE_MAX_RESULTS", 100))
-        self.CALENDAR_MAX_RESULTS = int(os.getenv("CALENDAR_MAX_RESULTS", 50))
+        self.GMAIL_MAX_RESULTS = int(env.get("GMAIL_MAX_RESULTS", 50))
+        self.DRIVE_MAX_RESULTS = int(env.get("DRIVE_MAX_RESULTS", 100))
+        self.CALENDAR_MAX_RESULTS = int(env.get("CALENDAR_MAX_RESULTS", 50))
         
         # Database Configuration (optional)
-        self.DATABASE_URL = os.getenv("DATABASE_URL", "")
+        self.DATABASE_URL = env.get("DATABASE_URL", "")
         
         # Monitoring Configuration
-        self.HEALTH_CHECK_ENABLED = os.getenv("HEALTH_CHECK_ENABLED", "true").lower() == "true"
-        self.METRICS_ENABLED = os.getenv("METRICS_ENABLED", "false").lower() == "true"
-        self.PROMETHEUS_ENABLED = os.getenv("PROMETHEUS_ENABLED", "false").lower() == "true"
-        self.PROMETHEUS_PORT = int(os.getenv("PROMETHEUS_PORT", 9090))
+        self.HEALTH_CHECK_ENABLED = env.get("HEALTH_CHECK_ENABLED", "true").lower() == "true"
+        self.METRICS_ENABLED = env.get("METRICS_ENABLED", "false").lower() == "true"
+        self.PROMETHEUS_ENABLED = env.get("PROMETHEUS_ENABLED", "false").lower() == "true"
+        self.PROMETHEUS_PORT = int(env.get("PROMETHEUS_PORT", 9090))
     
     def is_production(self) -> bool:
         """Check if running in production environment"""
@@ -117,10 +127,8 @@ class Config:
         if not self.MULTI_ACCOUNT_ENABLED:
             return True
         
-        if not self.ALLOWED_GOOGLE_ACCOUNTS:
-            return True  # No restrictions if list is empty
-        
-        return email.lower() in [account.lower() for account in self.ALLOWED_GOOGLE_ACCOUNTS]
+        # No restrictions if list is empty
+        return not self._allowed_lower_set or email.lower() in self._allowed_lower_set
     
     def get_account_config(self, email: str) -> Dict[str, Any]:
         """Get configuration for a specific account"""
@@ -138,6 +146,10 @@ class Config:
     
     def setup_logging(self):
         """Setup logging configuration"""
+        if Config._logging_configured:
+            return
+        Config._logging_configured = True
+        
         log_level = getattr(logging, self.LOG_LEVEL, logging.INFO)
         
         # Configure root logger
@@ -152,7 +164,12 @@ class Config:
                 log_file_path = Path(self.LOG_FILE_PATH)
                 log_file_path.parent.mkdir(parents=True, exist_ok=True)
                 
-                file_handler = logging.FileHandler(log_file_path, mode='a')
+                file_handler = logging.handlers.RotatingFileHandler(
+                    log_file_path,
+                    mode='a',
+                    maxBytes=self.LOG_FILE_MAX_BYTES,
+                    backupCount=self.LOG_FILE_BACKUP_COUNT
+                )
                 file_handler.setLevel(logging.DEBUG)
                 
                 file_formatter = logging.Formatter(
@@ -202,5 +219,10 @@ class Config:
             "mcp_server_url": self.MCP_SERVER_URL
         }
 
-# Global configuration instance
-config = Config()
+@lru_cache(maxsize=1)
+def get_config() -> Config:
+    """Get global configuration instance"""
+    return Config()
+
+# Global configuration instance (kept for backwards compatibility)
+config = get_config()
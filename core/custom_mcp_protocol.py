@@ -7,24 +7,161 @@ import json
 import logging
 import inspect
 import asyncio
-from typing import Dict, List, Any, Optional, Callable
+from dataclasses import dataclass
+from typing import AsyncIterator, Awaitable, Dict, List, Any, Optional, Callable, Tuple, get_origin
 from fastapi import Request, Response
 from fastapi.responses import JSONResponse, StreamingResponse
 from core.server import server
 from core.session_manager import get_session_manager
 
+# Use orjson for request parsing and response rendering if available
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 session_manager = get_session_manager()
 
+def _stdlib_encode_json(obj: Any) -> bytes:
+    """Serialize an object to compact JSON bytes with the stdlib json module"""
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+if orjson is not None:
+    def _encode_json(obj: Any) -> bytes:
+        """Serialize an object to compact JSON bytes"""
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # orjson rejects integers beyond 64 bits, which stdlib json encodes exactly
+            return _stdlib_encode_json(obj)
+
+    _decode_json = orjson.loads
+else:
+    _encode_json = _stdlib_encode_json
+    _decode_json = json.loads
+
+_JSONRPC_PREFIX = b'{"jsonrpc":"2.0","id":'
+
+# JSON Schema types for parameter annotations; anything else is exposed as a string
+_ANN_TO_JSON = {
+    str: "string",
+    int: "integer",
+    float: "number",
+    bool: "boolean",
+    list: "array",
+    tuple: "array",
+    set: "array",
+    dict: "object",
+    bytes: "string",
+}
+
+# Origins of parameterized annotations (List[str], tuple[int, ...]) exposed as arrays
+_ARRAY_ORIGINS = (list, tuple, set)
+
+# Tool results longer than this many characters are streamed in chunks
+_STREAM_THRESHOLD = 64 * 1024
+_STREAM_CHUNK_SIZE = 16 * 1024
+
+# Request bodies larger than this are read into a buffer preallocated from Content-Length
+_PREALLOCATE_BODY_THRESHOLD = 64 * 1024
+# Content-Length is client-controlled, so never preallocate more than this
+_MAX_PREALLOCATE_BODY = 1024 * 1024
+
+# Server capabilities and info are constant, so the initialize result is encoded once
+_INITIALIZE_RESULT_BYTES = _encode_json({
+    "protocolVersion": "2024-11-05",
+    "capabilities": {
+        "tools": {"listChanged": False},
+        "resources": {"subscribe": False, "listChanged": False},
+        "prompts": {"listChanged": False},
+        "experimental": {}
+    },
+    "serverInfo": {
+        "name": "google_workspace",
+        "version": "1.12.0"
+    }
+})
+
+class ORJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson (falls back to stdlib json)"""
+    
+    def render(self, content: Any) -> bytes:
+        return _encode_json(content)
+
+@dataclass(slots=True)
+class ToolDescriptor:
+    """Call metadata for a tool, precomputed from its signature at discovery"""
+    func: Callable
+    param_names: Tuple[str, ...]
+    defaults: Dict[str, Any]
+    has_session: bool
+    is_coro: bool
+    description: str
+    
+    @classmethod
+    def from_func(cls, name: str, func: Callable) -> "ToolDescriptor":
+        """Build a descriptor by inspecting the tool signature once"""
+        param_names = []
+        defaults = {}
+        has_session = False
+        
+        for param_name, param in inspect.signature(func).parameters.items():
+            if param_name == 'mcp_session_id':
+                has_session = True
+                continue
+            param_names.append(param_name)
+            if param.default != inspect.Parameter.empty:
+                defaults[param_name] = param.default
+        
+        is_coro = asyncio.iscoroutinefunction(func) or inspect.iscoroutinefunction(func)
+        # First docstring line only
+        description = (func.__doc__ or f"Tool: {name}").strip().split('\n', 1)[0]
+        
+        return cls(func=func, param_names=tuple(param_names), defaults=defaults,
+                   has_session=has_session, is_coro=is_coro, description=description)
+
 class CustomMCPProtocol:
     """Custom MCP Protocol Implementation"""
     
+    __slots__ = (
+        "tools_registry",
+        "resources_registry",
+        "prompts_registry",
+        "_methods",
+        "_discovered_count",
+        "_tools_list_cache",
+        "_tools_json_bytes",
+        "_resources_json_bytes",
+        "_prompts_json_bytes",
+    )
+    
     def __init__(self):
-        self.tools_registry: Dict[str, Callable] = {}
+        self.tools_registry: Dict[str, ToolDescriptor] = {}
         self.resources_registry: Dict[str, Callable] = {}
         self.prompts_registry: Dict[str, Callable] = {}
+        self._tools_list_cache: List[Dict[str, Any]] = []
+        self._tools_json_bytes: bytes = b'{"tools":[]}'
+        self._resources_json_bytes: bytes = b'{"resources":[]}'
+        self._prompts_json_bytes: bytes = b'{"prompts":[]}'
+        self._discovered_count = 0
+        self._methods: Dict[str, Callable[..., Awaitable[Response]]] = {
+            "initialize": self._handle_initialize,
+            "tools/list": self._handle_tools_list,
+            "resources/list": self._handle_resources_list,
+            "prompts/list": self._handle_prompts_list,
+            "tools/call": self._handle_tools_call,
+        }
         self._discover_tools()
     
+    def _refresh_tools(self):
+        """Re-run discovery if tools were registered on the server since the last run"""
+        # This module is imported before main.py loads the tool modules
+        tools = getattr(server, '_tools', None)
+        if tools is not None and len(tools) != self._discovered_count:
+            self.tools_registry = {}
+            self._discover_tools()
+    
     def _discover_tools(self):
         """Discover tools from FastMCP server"""
         try:
@@ -32,26 +169,43 @@ class CustomMCPProtocol:
             if hasattr(server, '_tools') and server._tools:
                 for tool_name, tool_info in server._tools.items():
                     if hasattr(tool_info, 'func'):
-                        self.tools_registry[tool_name] = tool_info.func
+                        self.tools_registry[tool_name] = ToolDescriptor.from_func(tool_name, tool_info.func)
                         logger.info(f"Discovered tool: {tool_name}")
+                self._discovered_count = len(server._tools)
             
-            # Also check for tools in server attributes
-            for attr_name in dir(server):
-                attr = getattr(server, attr_name)
-                if hasattr(attr, '__mcp_tool__'):
-                    self.tools_registry[attr_name] = attr
-                    logger.info(f"Discovered tool via attribute: {attr_name}")
+            # Fall back to scanning server attributes only if the registry is empty
+            if not self.tools_registry:
+                for attr_name in dir(server):
+                    attr = getattr(server, attr_name)
+                    if hasattr(attr, '__mcp_tool__'):
+                        self.tools_registry[attr_name] = ToolDescriptor.from_func(attr_name, attr)
+                        logger.info(f"Discovered tool via attribute: {attr_name}")
             
             logger.info(f"Total tools discovered: {len(self.tools_registry)}")
             
         except Exception as e:
             logger.error(f"Error discovering tools: {e}")
+        
+        self._build_list_caches()
+    
+    def _build_list_caches(self):
+        """Precompute list results, rebuilt only when discovery runs again"""
+        self._tools_list_cache = self._build_tools_schema()
+        self._tools_json_bytes = _encode_json({"tools": self._tools_list_cache})
+        self._resources_json_bytes = _encode_json({"resources": self.get_resources_list()})
+        self._prompts_json_bytes = _encode_json({"prompts": self.get_prompts_list()})
     
     def get_tools_list(self) -> List[Dict[str, Any]]:
         """Get list of available tools with proper schema"""
+        self._refresh_tools()
+        return self._tools_list_cache
+    
+    def _build_tools_schema(self) -> List[Dict[str, Any]]:
+        """Build tool schemas from the registered tool signatures"""
         tools = []
         
-        for tool_name, tool_func in self.tools_registry.items():
+        for tool_name, descriptor in self.tools_registry.items():
+            tool_func = descriptor.func
             try:
                 # Get function signature
                 sig = inspect.signature(tool_func)
@@ -72,14 +226,10 @@ class CustomMCPProtocol:
                     
                     # Infer type from annotation
                     if param.annotation != inspect.Parameter.empty:
-                        if param.annotation == str:
-                            param_info["type"] = "string"
-                        elif param.annotation == int:
-                            param_info["type"] = "integer"
-                        elif param.annotation == bool:
-                            param_info["type"] = "boolean"
-                        elif param.annotation == list or str(param.annotation).startswith('List'):
+                        if get_origin(param.annotation) in _ARRAY_ORIGINS:
                             param_info["type"] = "array"
+                        else:
+                            param_info["type"] = _ANN_TO_JSON.get(param.annotation, "string")
                     
                     # Check if required
                     if param.default == inspect.Parameter.empty:
@@ -87,14 +237,9 @@ class CustomMCPProtocol:
                     
                     properties[param_name] = param_info
                 
-                # Get description from docstring
-                description = tool_func.__doc__ or f"Tool: {tool_name}"
-                if description:
-                    description = description.strip().split('\n')[0]  # First line only
-                
                 tool_data = {
                     "name": tool_name,
-                    "description": description,
+                    "description": descriptor.description,
                     "inputSchema": {
                         "type": "object",
                         "properties": properties,
@@ -131,26 +276,26 @@ class CustomMCPProtocol:
     
     async def call_tool(self, tool_name: str, arguments: Dict[str, Any], session_id: Optional[str] = None) -> Any:
         """Call a tool with given arguments"""
+        self._refresh_tools()
         if tool_name not in self.tools_registry:
             raise ValueError(f"Tool '{tool_name}' not found")
         
-        tool_func = self.tools_registry[tool_name]
+        descriptor = self.tools_registry[tool_name]
+        tool_func = descriptor.func
         
         try:
-            # Prepare arguments
-            sig = inspect.signature(tool_func)
-            call_args = {}
-            
-            for param_name, param in sig.parameters.items():
-                if param_name == 'mcp_session_id':
-                    call_args[param_name] = session_id
-                elif param_name in arguments:
-                    call_args[param_name] = arguments[param_name]
-                elif param.default != inspect.Parameter.empty:
-                    call_args[param_name] = param.default
+            # Prepare arguments from the precomputed parameter layout
+            defaults = descriptor.defaults
+            call_args = {
+                param_name: arguments[param_name] if param_name in arguments else defaults[param_name]
+                for param_name in descriptor.param_names
+                if param_name in arguments or param_name in defaults
+            }
+            if descriptor.has_session:
+                call_args['mcp_session_id'] = session_id
             
             # Call the tool
-            if asyncio.iscoroutinefunction(tool_func):
+            if descriptor.is_coro:
                 result = await tool_func(**call_args)
             else:
                 result = tool_func(**call_args)
@@ -161,21 +306,88 @@ class CustomMCPProtocol:
             logger.error(f"Error calling tool {tool_name}: {e}")
             raise
     
-    def create_mcp_response(self, request_id: Any, result: Any = None, error: Dict[str, Any] = None) -> Dict[str, Any]:
-        """Create MCP JSON-RPC response"""
-        response = {
-            "jsonrpc": "2.0",
-            "id": request_id
-        }
+    async def _handle_initialize(self, request_id: Any, params: Dict[str, Any],
+                                 session_id: Optional[str]) -> Response:
+        """Handle initialize"""
+        client_info = params.get('clientInfo')
+        capabilities = params.get('capabilities')
+        if client_info is None:
+            client_info = {}
+        if capabilities is None:
+            capabilities = {}
+        if not isinstance(client_info, dict) or not isinstance(capabilities, dict):
+            return self.create_error_response(
+                request_id, -32602, "Invalid params: clientInfo and capabilities must be objects", status_code=400
+            )
         
-        if error:
-            response["error"] = error
-        else:
-            response["result"] = result
+        session_id = session_manager.get_or_create_session(session_id).session_id
+        session_manager.initialize_session(session_id, client_info, capabilities)
         
+        # Return with session ID header
+        response = self.create_cached_response(request_id, _INITIALIZE_RESULT_BYTES)
+        response.headers['mcp-session-id'] = session_id
         return response
     
-    def create_error_response(self, request_id: Any, code: int, message: str, data: Any = None) -> Dict[str, Any]:
+    async def _handle_tools_list(self, request_id: Any, params: Dict[str, Any],
+                                 session_id: Optional[str]) -> Response:
+        """Handle tools/list"""
+        self._refresh_tools()
+        return self.create_cached_response(request_id, self._tools_json_bytes)
+    
+    async def _handle_resources_list(self, request_id: Any, params: Dict[str, Any],
+                                     session_id: Optional[str]) -> Response:
+        """Handle resources/list"""
+        return self.create_cached_response(request_id, self._resources_json_bytes)
+    
+    async def _handle_prompts_list(self, request_id: Any, params: Dict[str, Any],
+                                   session_id: Optional[str]) -> Response:
+        """Handle prompts/list"""
+        return self.create_cached_response(request_id, self._prompts_json_bytes)
+    
+    async def _handle_tools_call(self, request_id: Any, params: Dict[str, Any],
+                                 session_id: Optional[str]) -> Response:
+        """Handle tools/call"""
+        tool_name = params.get('name')
+        arguments = params.get('arguments', {})
+        
+        if not tool_name:
+            return self.create_error_response(request_id, -32602, "Invalid params: Missing tool name", status_code=400)
+        
+        try:
+            result = await self.call_tool(tool_name, arguments, session_id)
+            text = str(result)
+            if len(text) > _STREAM_THRESHOLD:
+                # Encoding fails on lone surrogates; check now, since a failure mid-stream would truncate a 200.
+                # Slices are encoded and discarded so no full-size copy is made
+                if not text.isascii():
+                    for start in range(0, len(text), _STREAM_CHUNK_SIZE):
+                        text[start:start + _STREAM_CHUNK_SIZE].encode('utf-8')
+                return StreamingResponse(self._stream_text_result(request_id, text), media_type="application/json")
+            return self.create_mcp_response(request_id, {"content": [{"type": "text", "text": text}]})
+        except UnicodeEncodeError as e:  # a ValueError, but not a lookup failure
+            return self.create_error_response(request_id, -32603, f"Internal error: {str(e)}", status_code=500)
+        except ValueError as e:
+            return self.create_error_response(request_id, -32601, f"Method not found: {str(e)}", status_code=404)
+        except Exception as e:
+            return self.create_error_response(request_id, -32603, f"Internal error: {str(e)}", status_code=500)
+    
+    async def _stream_text_result(self, request_id: Any, text: str) -> AsyncIterator[bytes]:
+        """Stream a text tool result as a JSON-RPC response, encoding the text chunk by chunk"""
+        yield _JSONRPC_PREFIX + _encode_json(request_id) + b',"result":{"content":[{"type":"text","text":"'
+        for start in range(0, len(text), _STREAM_CHUNK_SIZE):
+            # JSON string escaping is per character, so encoded chunks can be joined without their quotes
+            yield _encode_json(text[start:start + _STREAM_CHUNK_SIZE])[1:-1]
+        yield b'"}]}}'
+    
+    def create_mcp_response(self, request_id: Any, result: Any = None, error: Dict[str, Any] = None,
+                            status_code: int = 200) -> Response:
+        """Create MCP JSON-RPC response"""
+        if error:
+            return self._create_raw_response(request_id, b',"error":', _encode_json(error), status_code)
+        return self._create_raw_response(request_id, b',"result":', _encode_json(result), status_code)
+    
+    def create_error_response(self, request_id: Any, code: int, message: str, data: Any = None,
+                              status_code: int = 200) -> Response:
         """Create MCP error response"""
         error = {
             "code": code,
@@ -184,141 +396,96 @@ class CustomMCPProtocol:
         if data is not None:
             error["data"] = data
         
-        return self.create_mcp_response(request_id, error=error)
+        return self.create_mcp_response(request_id, error=error, status_code=status_code)
+    
+    def create_cached_response(self, request_id: Any, result_bytes: bytes) -> Response:
+        """Create MCP JSON-RPC response around a pre-serialized result"""
+        return self._create_raw_response(request_id, b',"result":', result_bytes)
+    
+    def _create_raw_response(self, request_id: Any, member: bytes, payload: bytes,
+                             status_code: int = 200) -> Response:
+        """Concatenate the fixed JSON-RPC envelope around an already encoded payload"""
+        body = _JSONRPC_PREFIX + _encode_json(request_id) + member + payload + b'}'
+        return Response(content=body, status_code=status_code, media_type="application/json")
 
 # Global MCP protocol instance
 mcp_protocol = CustomMCPProtocol()
 
+def _get_session_header(request: Request) -> Optional[str]:
+    """Get the MCP session ID from the raw ASGI headers"""
+    for name, value in request.scope["headers"]:
+        if name == b"mcp-session-id":
+            return value.decode("latin-1")
+    return None
+
+async def _read_body(request: Request) -> bytes:
+    """Read the request body, preallocating the buffer for large requests"""
+    try:
+        size = int(request.headers.get('content-length', 0))
+    except ValueError:
+        size = 0
+    if size <= _PREALLOCATE_BODY_THRESHOLD:
+        return await request.body()
+    
+    buffer = bytearray(min(size, _MAX_PREALLOCATE_BODY))
+    pos = 0
+    async for chunk in request.stream():
+        end = pos + len(chunk)
+        # Grows the buffer once the preallocated part is filled
+        buffer[pos:end] = chunk
+        pos = end
+    del buffer[pos:]
+    return buffer
+
 async def handle_mcp_request(request: Request) -> Response:
     """Handle MCP protocol requests"""
+    # Unexpected errors propagate to the server's exception handling; the
+    # failure modes of a malformed request are answered explicitly below
+    
+    # Get session ID from header
+    session_id = _get_session_header(request)
+    
+    # Parse JSON-RPC request
+    body = await _read_body(request)
+    if not body:
+        return mcp_protocol.create_error_response(None, -32700, "Parse error: Empty request", status_code=400)
+    
     try:
-        # Get session ID from header
-        session_id = request.headers.get('mcp-session-id')
-        if not session_id:
-            # Try to create or get session
-            session = session_manager.get_or_create_session()
-            session_id = session.session_id
-        
-        # Parse JSON-RPC request
-        body = await request.body()
-        if not body:
-            return JSONResponse(
-                mcp_protocol.create_error_response(None, -32700, "Parse error: Empty request"),
-                status_code=400
-            )
-        
-        try:
-            rpc_request = json.loads(body.decode('utf-8'))
-        except json.JSONDecodeError as e:
-            return JSONResponse(
-                mcp_protocol.create_error_response(None, -32700, f"Parse error: {str(e)}"),
-                status_code=400
-            )
-        
-        # Validate JSON-RPC format
-        if not isinstance(rpc_request, dict) or rpc_request.get('jsonrpc') != '2.0':
-            return JSONResponse(
-                mcp_protocol.create_error_response(
-                    rpc_request.get('id'), -32600, "Invalid Request: Not a valid JSON-RPC 2.0 request"
-                ),
-                status_code=400
-            )
-        
-        request_id = rpc_request.get('id')
-        method = rpc_request.get('method')
-        params = rpc_request.get('params', {})
-        
-        if not method:
-            return JSONResponse(
-                mcp_protocol.create_error_response(request_id, -32600, "Invalid Request: Missing method"),
-                status_code=400
-            )
-        
-        # Handle different MCP methods
-        if method == 'initialize':
-            # Handle initialize
-            session = session_manager.get_or_create_session(session_id)
-            client_info = params.get('clientInfo', {})
-            capabilities = params.get('capabilities', {})
-            
-            session_manager.initialize_session(session_id, client_info, capabilities)
-            
-            result = {
-                "protocolVersion": "2024-11-05",
-                "capabilities": {
-                    "tools": {"listChanged": False},
-                    "resources": {"subscribe": False, "listChanged": False},
-                    "prompts": {"listChanged": False},
-                    "experimental": {}
-                },
-                "serverInfo": {
-                    "name": "google_workspace",
-                    "version": "1.12.0"
-                }
-            }
-            
-            response_data = mcp_protocol.create_mcp_response(request_id, result)
-            
-            # Return with session ID header
-            response = JSONResponse(response_data)
-            response.headers['mcp-session-id'] = session_id
-            return response
-        
-        elif method == 'tools/list':
-            # Handle tools/list
-            tools = mcp_protocol.get_tools_list()
-            result = {"tools": tools}
-            return JSONResponse(mcp_protocol.create_mcp_response(request_id, result))
-        
-        elif method == 'resources/list':
-            # Handle resources/list
-            resources = mcp_protocol.get_resources_list()
-            result = {"resources": resources}
-            return JSONResponse(mcp_protocol.create_mcp_response(request_id, result))
-        
-        elif method == 'prompts/list':
-            # Handle prompts/list
-            prompts = mcp_protocol.get_prompts_list()
-            result = {"prompts": prompts}
-            return JSONResponse(mcp_protocol.create_mcp_response(request_id, result))
-        
-        elif method == 'tools/call':
-            # Handle tools/call
-            tool_name = params.get('name')
-            arguments = params.get('arguments', {})
-            
-            if not tool_name:
-                return JSONResponse(
-                    mcp_protocol.create_error_response(request_id, -32602, "Invalid params: Missing tool name"),
-                    status_code=400
-                )
-            
-            try:
-                result = await mcp_protocol.call_tool(tool_name, arguments, session_id)
-                return JSONResponse(mcp_protocol.create_mcp_response(request_id, {"content": [{"type": "text", "text": str(result)}]}))
-            except ValueError as e:
-                return JSONResponse(
-                    mcp_protocol.create_error_response(request_id, -32601, f"Method not found: {str(e)}"),
-                    status_code=404
-                )
-            except Exception as e:
-                return JSONResponse(
-                    mcp_protocol.create_error_response(request_id, -32603, f"Internal error: {str(e)}"),
-                    status_code=500
-                )
-        
-        else:
-            # Unknown method
-            return JSONResponse(
-                mcp_protocol.create_error_response(request_id, -32601, f"Method not found: {method}"),
-                status_code=404
-            )
+        rpc_request = _decode_json(body)
+    except ValueError as e:  # JSONDecodeError (stdlib and orjson) and UnicodeDecodeError on non-UTF-8 bodies
+        return mcp_protocol.create_error_response(None, -32700, f"Parse error: {str(e)}", status_code=400)
+    
+    # Validate JSON-RPC format
+    if not isinstance(rpc_request, dict):
+        return mcp_protocol.create_error_response(
+            None, -32600, "Invalid Request: Not a valid JSON-RPC 2.0 request", status_code=400
+        )
     
-    except Exception as e:
-        logger.error(f"Error handling MCP request: {e}")
-        return JSONResponse(
-            mcp_protocol.create_error_response(None, -32603, f"Internal error: {str(e)}"),
-            status_code=500
+    request_id = rpc_request.get('id')
+    if isinstance(request_id, float) and orjson is not None:
+        # orjson reads integers beyond 64 bits as floats; re-parse so the id is echoed unchanged
+        request_id = json.loads(body).get('id')
+    if rpc_request.get('jsonrpc') != '2.0':
+        return mcp_protocol.create_error_response(
+            request_id, -32600, "Invalid Request: Not a valid JSON-RPC 2.0 request", status_code=400
         )
+    
+    method = rpc_request.get('method')
+    params = rpc_request.get('params', {})
+    
+    if not method or not isinstance(method, str):
+        return mcp_protocol.create_error_response(request_id, -32600, "Invalid Request: Missing method", status_code=400)
+    
+    if not isinstance(params, dict):
+        return mcp_protocol.create_error_response(request_id, -32602, "Invalid params: Expected an object", status_code=400)
+    
+    # Dispatch to the method handler
+    handler = mcp_protocol._methods.get(method)
+    if handler is None:
+        return mcp_protocol.create_error_response(request_id, -32601, f"Method not found: {method}", status_code=404)
+    
+    # Without a session header the request runs session-less; a session created here could
+    # never be reused (its ID is not returned) and would only push live sessions out of the LRU
+    return await handler(request_id, params, session_id or None)
 
 logger.info("Custom MCP Protocol initialized")
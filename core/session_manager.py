@@ -2,117 +2,257 @@
 Enhanced Session Management for MCP Server
 """
 
-import uuid
+import heapq
+import secrets
 import time
 import logging
-from typing import Dict, Optional, Any
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Any, Tuple
 from dataclasses import dataclass, field
 from threading import Lock
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Shared read-only default for session mappings that have not been populated
+_EMPTY: Mapping[str, Any] = MappingProxyType({})
+
+def _empty_mapping() -> Mapping[str, Any]:
+    """Default factory returning the shared empty mapping (dataclasses reject it as a plain default)"""
+    return _EMPTY
+
+# Sessions are spread over this many independently locked shards (power of two)
+_SHARD_COUNT = 32
+
+@dataclass(slots=True)
 class MCPSession:
     """MCP Session data structure"""
     session_id: str
-    created_at: float = field(default_factory=time.time)
-    last_accessed: float = field(default_factory=time.time)
+    # Timestamps are time.monotonic() values, immune to wall-clock jumps
+    created_at: float = field(default_factory=time.monotonic)
+    last_accessed: float = field(default_factory=time.monotonic)
     user_email: Optional[str] = None
     initialized: bool = False
-    client_info: Dict[str, Any] = field(default_factory=dict)
-    capabilities: Dict[str, Any] = field(default_factory=dict)
+    client_info: Mapping[str, Any] = field(default_factory=_empty_mapping)
+    capabilities: Mapping[str, Any] = field(default_factory=_empty_mapping)
+    # Fields of get_session_info that only change on initialize
+    static_info: Mapping[str, Any] = field(default_factory=_empty_mapping, repr=False)
     
     def touch(self):
         """Update last accessed time"""
-        self.last_accessed = time.time()
+        self.last_accessed = time.monotonic()
     
-    def is_expired(self, timeout_seconds: int = 3600) -> bool:
+    def is_expired(self, timeout_seconds: int = 3600, now: Optional[float] = None) -> bool:
         """Check if session is expired"""
-        return (time.time() - self.last_accessed) > timeout_seconds
+        if now is None:
+            now = time.monotonic()
+        return (now - self.last_accessed) > timeout_seconds
+
+class _SessionShard:
+    """A slice of the session store with copy-on-write publication.
+
+    Readers use ``sessions`` without locking. Writers hold ``lock``, mutate a
+    copy of the dict and rebind ``sessions``, so a published dict is never
+    modified in place. ``expiry_heap`` holds ``(last_accessed, session_id)``
+    entries and is only touched under ``lock``.
+    """
+    
+    __slots__ = ("lock", "sessions", "expiry_heap")
+    
+    def __init__(self):
+        self.lock = Lock()
+        self.sessions: Dict[str, MCPSession] = {}
+        self.expiry_heap: List[Tuple[float, str]] = []
 
 class SessionManager:
     """Enhanced session manager for MCP server"""
     
-    def __init__(self, session_timeout: int = 3600):
-        self.sessions: Dict[str, MCPSession] = {}
+    def __init__(self, session_timeout: int = 3600, max_sessions: int = 10000):
+        self._shards: List[_SessionShard] = [_SessionShard() for _ in range(_SHARD_COUNT)]
         self.session_timeout = session_timeout
-        self._lock = Lock()
-        logger.info(f"SessionManager initialized with {session_timeout}s timeout")
+        self.max_sessions = max_sessions
+        # The bound is enforced per shard (ceil(max_sessions / shards) each), so an unevenly
+        # loaded shard can start evicting before the total reaches max_sessions
+        self._shard_capacity = max(1, -(-max_sessions // _SHARD_COUNT))
+        # Minimum seconds between cleanup sweeps; -inf lets the first call always run
+        self._cleanup_min_interval = 60.0
+        self._last_cleanup = float('-inf')
+        self._cleanup_lock = Lock()
+        logger.info("SessionManager initialized with %ss timeout", session_timeout)
+    
+    def _shard(self, session_id: str) -> _SessionShard:
+        """Get the shard owning a session ID"""
+        return self._shards[hash(session_id) & (_SHARD_COUNT - 1)]
+    
+    def _peek(self, session_id: str) -> Optional[MCPSession]:
+        """Get session by ID without touching it"""
+        return self._shard(session_id).sessions.get(session_id)
     
     def create_session(self, session_id: Optional[str] = None) -> MCPSession:
         """Create a new session"""
         if not session_id:
-            session_id = str(uuid.uuid4())
+            session_id = secrets.token_hex(16)
         
-        with self._lock:
-            session = MCPSession(session_id=session_id)
-            self.sessions[session_id] = session
-            logger.info(f"Created new session: {session_id}")
-            return session
+        shard = self._shard(session_id)
+        with shard.lock:
+            return self._insert_session(shard, session_id)
+    
+    def _insert_session(self, shard: _SessionShard, session_id: str) -> MCPSession:
+        """Create and publish a session in its shard (caller holds the shard lock)"""
+        session = MCPSession(session_id=session_id)
+        sessions = dict(shard.sessions)
+        sessions[session_id] = session
+        heapq.heappush(shard.expiry_heap, (session.last_accessed, session_id))
+        
+        # Evict least recently used sessions once the shard is over capacity
+        while len(sessions) > self._shard_capacity:
+            evicted = self._pop_lru(shard.expiry_heap, sessions)
+            if evicted is None:
+                break
+            del sessions[evicted]
+            logger.info("Evicted least recently used session: %s", evicted)
+        
+        shard.sessions = sessions
+        logger.info("Created new session: %s", session_id)
+        return session
     
     def get_session(self, session_id: str) -> Optional[MCPSession]:
         """Get session by ID"""
-        with self._lock:
-            session = self.sessions.get(session_id)
-            if session:
-                if session.is_expired(self.session_timeout):
-                    logger.info(f"Session {session_id} expired, removing")
-                    del self.sessions[session_id]
-                    return None
-                session.touch()
-                return session
-            return None
+        # Lock-free read of the shard's published snapshot; an unknown or
+        # evicted ID costs a single dict miss, so no negative cache is kept
+        session = self._shard(session_id).sessions.get(session_id)
+        if session:
+            now = time.monotonic()
+            # Expiry check and touch are inlined; this runs on every request
+            if now - session.last_accessed > self.session_timeout:
+                # Leave removal to cleanup_expired_sessions instead of copying the shard here
+                logger.info("Session %s expired", session_id)
+                return None
+            session.last_accessed = now
+            return session
+        return None
     
     def get_or_create_session(self, session_id: Optional[str] = None) -> MCPSession:
         """Get existing session or create new one"""
         if session_id:
+            # Lock-free fast path for an existing session
             session = self.get_session(session_id)
             if session:
                 return session
+        else:
+            session_id = secrets.token_hex(16)
         
-        # Create new session
-        return self.create_session(session_id)
+        # Re-check and create under one shard lock so concurrent callers share a session
+        shard = self._shard(session_id)
+        with shard.lock:
+            session = shard.sessions.get(session_id)
+            now = time.monotonic()
+            if session and now - session.last_accessed <= self.session_timeout:
+                session.last_accessed = now
+                return session
+            return self._insert_session(shard, session_id)
     
     def initialize_session(self, session_id: str, client_info: Dict[str, Any], 
                           capabilities: Dict[str, Any]) -> bool:
         """Initialize session with client info"""
         session = self.get_session(session_id)
         if not session:
-            logger.warning(f"Cannot initialize non-existent session: {session_id}")
+            logger.warning("Cannot initialize non-existent session: %s", session_id)
             return False
         
-        session.client_info = client_info
-        session.capabilities = capabilities
+        # Copy into session-owned dicts so the caller's dicts are never aliased
+        session.client_info = self._update_mapping(session.client_info, client_info)
+        session.capabilities = self._update_mapping(session.capabilities, capabilities)
         session.initialized = True
-        session.touch()
+        session.static_info = self._build_static_info(session)
         
-        logger.info(f"Session {session_id} initialized with client: {client_info.get('name', 'unknown')}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Session %s initialized with client: %s", session_id, client_info.get('name', 'unknown'))
         return True
     
+    @staticmethod
+    def _update_mapping(current: Mapping[str, Any], values: Mapping[str, Any]) -> Dict[str, Any]:
+        """Replace the contents of a session-owned dict, allocating one only on first use"""
+        if current is _EMPTY:
+            return dict(values)
+        # Re-initializing with the session's own dict; clearing it would lose the contents
+        if current is values:
+            return current
+        current.clear()
+        current.update(values)
+        return current
+    
     def is_session_initialized(self, session_id: str) -> bool:
         """Check if session is initialized"""
-        session = self.get_session(session_id)
-        return session.initialized if session else False
+        session = self._peek(session_id)
+        return bool(session and not session.is_expired(self.session_timeout) and session.initialized)
     
     def cleanup_expired_sessions(self):
         """Remove expired sessions"""
-        with self._lock:
-            expired_sessions = [
-                sid for sid, session in self.sessions.items()
-                if session.is_expired(self.session_timeout)
-            ]
-            
-            for sid in expired_sessions:
-                del self.sessions[sid]
-                logger.info(f"Cleaned up expired session: {sid}")
+        now = time.monotonic()
+        # Check-and-set under a lock so racing callers run at most one sweep per interval
+        with self._cleanup_lock:
+            if now - self._last_cleanup < self._cleanup_min_interval:
+                return
+            self._last_cleanup = now
+        
+        expired_count = 0
+        
+        # Sweep one shard at a time so the others stay available
+        for shard in self._shards:
+            with shard.lock:
+                expired_sessions = self._pop_expired(shard, now)
+                
+                if expired_sessions:
+                    sessions = dict(shard.sessions)
+                    for sid in expired_sessions:
+                        del sessions[sid]
+                        logger.info("Cleaned up expired session: %s", sid)
+                    shard.sessions = sessions
             
-            if expired_sessions:
-                logger.info(f"Cleaned up {len(expired_sessions)} expired sessions")
+            expired_count += len(expired_sessions)
+        
+        if expired_count:
+            logger.info("Cleaned up %d expired sessions", expired_count)
+    
+    def _pop_expired(self, shard: _SessionShard, now: float) -> List[str]:
+        """Pop expired session IDs off a shard's expiry heap (caller holds the shard lock)"""
+        heap = shard.expiry_heap
+        sessions = shard.sessions
+        # A replaced session ID can have more than one entry, so dedupe the result
+        expired_sessions: Dict[str, None] = {}
+        
+        while heap and now - heap[0][0] > self.session_timeout:
+            sid = self._pop_lru(heap, sessions)
+            if sid is None:
+                break
+            last_accessed = sessions[sid].last_accessed
+            if now - last_accessed <= self.session_timeout:
+                heapq.heappush(heap, (last_accessed, sid))
+                break
+            expired_sessions[sid] = None
+        
+        return list(expired_sessions)
+    
+    def _pop_lru(self, heap: List[Tuple[float, str]], sessions: Dict[str, MCPSession]) -> Optional[str]:
+        """Pop the least recently used session ID off an expiry heap (caller holds the shard lock).
+
+        Entries for removed sessions are dropped and outdated entries are
+        re-pushed with the session's current last_accessed.
+        """
+        while heap:
+            last_accessed, sid = heapq.heappop(heap)
+            session = sessions.get(sid)
+            if session is None:
+                continue
+            if session.last_accessed != last_accessed:
+                heapq.heappush(heap, (session.last_accessed, sid))
+                continue
+            return sid
+        return None
     
     def get_session_count(self) -> int:
         """Get number of active sessions"""
-        with self._lock:
-            return len(self.sessions)
+        return sum(len(shard.sessions) for shard in self._shards)
     
     def get_session_info(self, session_id: str) -> Optional[Dict[str, Any]]:
         """Get session information for debugging"""
@@ -120,16 +260,29 @@ class SessionManager:
         if not session:
             return None
         
+        if not session.static_info:
+            session.static_info = self._build_static_info(session)
+        
+        # Report wall-clock timestamps, derived from the monotonic ones
+        now = time.monotonic()
+        
         return {
-            "session_id": session.session_id,
-            "created_at": session.created_at,
-            "last_accessed": session.last_accessed,
-            "age_seconds": time.time() - session.created_at,
-            "idle_seconds": time.time() - session.last_accessed,
+            **session.static_info,
+            "last_accessed": session.last_accessed + (time.time() - now),
+            "age_seconds": now - session.created_at,
+            "idle_seconds": now - session.last_accessed,
             "user_email": session.user_email,
-            "initialized": session.initialized,
-            "client_name": session.client_info.get("name", "unknown"),
-            "client_version": session.client_info.get("version", "unknown")
+            "initialized": session.initialized
+        }
+    
+    def _build_static_info(self, session: MCPSession) -> Dict[str, Any]:
+        """Build the get_session_info fields that only change on initialize"""
+        client_info = session.client_info
+        return {
+            "session_id": session.session_id,
+            "created_at": session.created_at + (time.time() - time.monotonic()),
+            "client_name": client_info.get("name", "unknown"),
+            "client_version": client_info.get("version", "unknown")
         }
 
 # Global session manager instance
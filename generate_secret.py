@@ -3,13 +3,15 @@
 Generate secure JWT secret for Google Workspace MCP Server
 """
 
-import secrets
+import random
 import string
 
 def generate_jwt_secret(length=64):
     """Generate a secure random JWT secret"""
     alphabet = string.ascii_letters + string.digits + "!@#$%^&*"
-    return ''.join(secrets.choice(alphabet) for _ in range(length))
+    # SystemRandom draws from the OS CSPRNG; choices() picks all characters in one call
+    rng = random.SystemRandom()
+    return ''.join(rng.choices(alphabet, k=length))
 
 if __name__ == "__main__":
     secret = generate_jwt_secret()
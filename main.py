@@ -1,4 +1,5 @@
 import argparse
+import asyncio
 import logging
 import os
 import sys
@@ -157,6 +158,14 @@ def main():
         safe_print("")
 
         if args.transport == 'streamable-http':
+            # Use uvloop for the HTTP event loop if available
+            try:
+                import uvloop
+                asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+                logger.info("Using uvloop event loop")
+            except ImportError:
+                pass
+
             # The server is already configured with port and server_url in core/server.py
             server.run(transport="streamable-http")
         else:
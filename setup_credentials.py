@@ -8,8 +8,31 @@ import os
 import json
 import sys
 from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
 from core.config import config
 
+# Use orjson for reading/writing client_secrets.json if available
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    def _dumps_indented(obj: Any) -> bytes:
+        """Serialize an object to 2-space indented JSON bytes"""
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+
+    _loads = orjson.loads
+else:
+    def _dumps_indented(obj: Any) -> bytes:
+        """Serialize an object to 2-space indented JSON bytes"""
+        return json.dumps(obj, indent=2).encode('utf-8')
+
+    _loads = json.loads
+
+# Last parsed client_secrets.json, keyed by (st_mtime_ns, st_size)
+_client_secrets_cache: Optional[Tuple[Tuple[int, int], Dict[str, Any]]] = None
+
 def create_client_secrets():
     """Create client_secrets.json from environment variables"""
     
@@ -40,8 +63,12 @@ def create_client_secrets():
     client_secrets_path = Path(__file__).parent / "client_secrets.json"
     
     try:
-        with open(client_secrets_path, 'w') as f:
-            json.dump(client_secrets, f, indent=2)
+        # Serialize once, write in a single call and atomically swap into place
+        data = _dumps_indented(client_secrets)
+        tmp_path = client_secrets_path.with_suffix('.tmp')
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, client_secrets_path)
         
         print(f"✅ Created client_secrets.json at {client_secrets_path}")
         print(f"   Client ID: {config.GOOGLE_CLIENT_ID[:20]}...")
@@ -52,6 +79,19 @@ def create_client_secrets():
         print(f"ERROR: Failed to create client_secrets.json: {e}")
         return False
 
+def _load_client_secrets(client_secrets_path: Path) -> Dict[str, Any]:
+    """Load client_secrets.json, reusing the last parse while the file is unchanged"""
+    global _client_secrets_cache
+    
+    st = client_secrets_path.stat()
+    key = (st.st_mtime_ns, st.st_size)
+    if _client_secrets_cache and _client_secrets_cache[0] == key:
+        return _client_secrets_cache[1]
+    
+    data = _loads(client_secrets_path.read_bytes())
+    _client_secrets_cache = (key, data)
+    return data
+
 def validate_credentials():
     """Validate that credentials file exists and is valid"""
     
@@ -62,8 +102,7 @@ def validate_credentials():
         return False
     
     try:
-        with open(client_secrets_path, 'r') as f:
-            data = json.load(f)
+        data = _load_client_secrets(client_secrets_path)
         
         required_fields = ['client_id', 'client_secret', 'auth_uri', 'token_uri']
         installed = data.get('installed', {})